@@ -6,6 +6,7 @@ a secure multi-party computation protocol.
 from __future__ import annotations
 from typing import Dict, List, Tuple, Sequence, Iterable
 import doctest
+import functools
 import math
 from modulo import modulo
 import tinynmc
@@ -16,24 +17,48 @@ Precision (*i.e.*, number of digits after the decimal point in a binary
 representation of a value) for fixed-point rationals.
 """
 
-def _encode(
-        descriptor: Sequence[float],
+_SCALE = 1 << _PRECISION
+"""
+Factor by which a value is multiplied to obtain its fixed-point encoding.
+"""
+
+@functools.lru_cache(maxsize=32)
+def _coordinates(
+        length: int,
         for_auth: bool = False
-    ) -> Dict[Tuple[int, int], int]:
+    ) -> Tuple[Tuple[int, int], ...]:
     """
-    Encode data for requests to nodes.
+    Return the coordinates of the factors contributed by a descriptor of the
+    specified length (these do not depend on the values in the descriptor).
     """
     reg_0_or_auth_1 = int(for_auth)
-    encoding = [round(value * (2 ** _PRECISION)) for value in descriptor]
-
-    coords_to_values = {
-        (reg_0_or_auth_1, 0): \
-            sum(value ** 2 for value in encoding)
-    }
-    for (index, value) in enumerate(encoding, 2):
-        coords_to_values[(index, reg_0_or_auth_1)] = (-2 if for_auth else 1) * value
+    return ((reg_0_or_auth_1, 0),) + tuple(
+        (index, reg_0_or_auth_1) for index in range(2, 2 + length)
+    )
 
-    return coords_to_values
+def _encode(
+        descriptor: Sequence[float],
+        for_auth: bool = False
+    ) -> List[int]:
+    """
+    Encode data for requests to nodes. The values are returned in the same
+    order as the coordinates returned by ``_coordinates``.
+    """
+    values = [0]
+    sum_of_squares = 0
+    if for_auth:
+        for value in descriptor:
+            encoded = round(value * _SCALE)
+            sum_of_squares += encoded * encoded
+            values.append(-2 * encoded)
+    else:
+        for value in descriptor:
+            encoded = round(value * _SCALE)
+            sum_of_squares += encoded * encoded
+            values.append(encoded)
+    values[0] = sum_of_squares
+
+    return values
 
 class node(tinynmc.node):
     """
@@ -111,6 +136,8 @@ class node(tinynmc.node):
     ... ))) <= 0.05
     True
     """
+    _signature: Tuple[int, ...]
+
     def authenticate(
             self: node,
             registration_token: token,
@@ -125,7 +152,7 @@ class node(tinynmc.node):
             local computation by this node.
         """
         return self.compute(
-            getattr(self, '_signature'),
+            self._signature,
             [registration_token, authentication_token]
         )
 
@@ -136,7 +163,7 @@ class request(List[Tuple[int, int]]):
     @staticmethod
     def registration(descriptor: Sequence[float]) -> request:
         """
-        Encode descriptor into a registration request.
+        Create a registration request for a descriptor.
 
         :param descriptor: Biometric descriptor to be used for registration.
 
@@ -147,12 +174,12 @@ class request(List[Tuple[int, int]]):
         >>> isinstance(request.registration(reg_descriptor), request)
         True
         """
-        return request(_encode(descriptor, False).keys())
+        return request(_coordinates(len(descriptor), False))
 
     @staticmethod
     def authentication(descriptor: Sequence[float]) -> request:
         """
-        Encode descriptor into an authentication request.
+        Create an authentication request for a descriptor.
 
         :param descriptor: Biometric descriptor to be used for authentication.
 
@@ -163,7 +190,7 @@ class request(List[Tuple[int, int]]):
         >>> isinstance(request.authentication(auth_descriptor), request)
         True
         """
-        return request(_encode(descriptor, True).keys())
+        return request(_coordinates(len(descriptor), True))
 
 class token(Dict[Tuple[int, int], modulo]):
     """
@@ -194,7 +221,11 @@ class token(Dict[Tuple[int, int], modulo]):
         >>> isinstance(token.registration(masks, descriptor), token)
         True
         """
-        return token(tinynmc.masked_factors(_encode(descriptor, False), masks))
+        coords_to_values = dict(zip(
+            _coordinates(len(descriptor), False),
+            _encode(descriptor, False)
+        ))
+        return token(tinynmc.masked_factors(coords_to_values, masks))
 
     @staticmethod
     def authentication(
@@ -221,7 +252,11 @@ class token(Dict[Tuple[int, int], modulo]):
         >>> isinstance(token.authentication(masks, descriptor), token)
         True
         """
-        return token(tinynmc.masked_factors(_encode(descriptor, True), masks))
+        coords_to_values = dict(zip(
+            _coordinates(len(descriptor), True),
+            _encode(descriptor, True)
+        ))
+        return token(tinynmc.masked_factors(coords_to_values, masks))
 
 def preprocess(nodes: Sequence[node], length: int):
     """
@@ -236,10 +271,11 @@ def preprocess(nodes: Sequence[node], length: int):
     >>> nodes = [node(), node(), node()]
     >>> preprocess(nodes, length=4)
     """
-    signature = [1, 1] + ([2] * length)
+    # A single immutable signature instance is shared by all of the nodes.
+    signature = (1, 1) + ((2,) * length)
     tinynmc.preprocess(signature, nodes)
     for node_ in nodes:
-        setattr(node_, '_signature', signature)
+        node_._signature = signature # pylint: disable=protected-access
 
 def reveal(shares: Iterable[modulo]) -> float:
     """
@@ -260,8 +296,33 @@ def reveal(shares: Iterable[modulo]) -> float:
 
     >>> abs(reveal(shares) - 0.43) <= 0.05 # Use comparison for floating point value.
     True
+
+    All shares must have the same modulus.
+
+    >>> reveal([modulo(3, 7), modulo(2, 11)])
+    Traceback (most recent call last):
+      ...
+    ValueError: congruence classes do not have the same modulus
+
+    An empty collection of shares is reconstructed as zero.
+
+    >>> reveal([])
+    0.0
     """
-    return math.sqrt(int(sum(shares)) / (2 ** (2 * _PRECISION)))
+    # Accumulate the shares as integers and reduce only once at the end.
+    total = 0
+    modulus = None
+    for share in shares:
+        if modulus is None:
+            modulus = share.modulus
+        elif share.modulus != modulus:
+            raise ValueError('congruence classes do not have the same modulus')
+        total += int(share)
+
+    if modulus is None:
+        return 0.0
+
+    return math.sqrt(total % modulus) / _SCALE
 
 if __name__ == '__main__':
     doctest.testmod() # pragma: no cover